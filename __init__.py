@@ -1,3 +1,3 @@
-__all__ = ["topsis_from_file", "topsis_dataframe"]
+__all__ = ["topsis_from_file", "topsis_from_file_streaming", "topsis_dataframe"]
 
-from .core import topsis_dataframe, topsis_from_file
+from .core import topsis_dataframe, topsis_from_file, topsis_from_file_streaming
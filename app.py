@@ -1,96 +1,154 @@
+import io
 import os
-import re
-import tempfile
-import smtplib
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from email.message import EmailMessage
+from typing import TYPE_CHECKING
 
-import pandas as pd
 from flask import Flask, render_template, request, redirect, flash
 
+# numpy, pandas and smtplib are imported where they are used, so the
+# app can start serving before the (slow) data stack has been loaded.
+if TYPE_CHECKING:
+    import pandas as pd
+
 app = Flask(__name__)
 app.secret_key = os.environ.get("FLASK_SECRET", "topsis-web-secret")
+# Larger request bodies are rejected with 413 before the upload is parsed
+app.config["MAX_CONTENT_LENGTH"] = 50 * 1024 * 1024
+
+# Emails are sent off the request thread; use a task queue (RQ/Celery) for multi-process deployments
+MAIL_POOL = ThreadPoolExecutor(max_workers=4)
+
 
-EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+def is_valid_email(email: str) -> bool:
+    # Same rule as ^[^@\s]+@[^@\s]+\.[^@\s]+$, checked without the regex engine
+    local, at, domain = email.partition("@")
+    return (
+        at == "@"
+        and local != ""
+        and "@" not in domain
+        and "." in domain[1:-1]
+        and not any(map(str.isspace, email))
+    )
 
 
 def parse_weights_impacts(weights_s: str, impacts_s: str):
-    w_parts = [x.strip() for x in weights_s.split(",")]
-    i_parts = [x.strip() for x in impacts_s.split(",")]
+    import numpy as np
 
-    if not w_parts or not i_parts or any(x == "" for x in w_parts) or any(x == "" for x in i_parts):
+    w_parts = weights_s.split(",")
+    impacts = [x.strip() for x in impacts_s.split(",")]
+
+    if "" in impacts or any(not x.strip() for x in w_parts):
         raise ValueError("Impacts and weights must be separated by ',' (comma).")
 
+    # NumPy parses (and strips) the whole list in C, straight into the array TOPSIS uses
     try:
-        weights = [float(x) for x in w_parts]
-    except Exception:
+        weights = np.array(w_parts, dtype=np.float64)
+    except ValueError:
         raise ValueError("Weights must be numeric values separated by commas.")
 
-    impacts = i_parts
-    if any(x not in ["+", "-"] for x in impacts):
+    if not set(impacts) <= {"+", "-"}:
         raise ValueError("Impacts must be either + or -.")
 
-    return weights, impacts
+    # +1.0 for benefit (+), -1.0 for cost (-) criteria
+    impact_signs = np.where(np.array(impacts) == "+", 1.0, -1.0)
+    return weights, impact_signs
 
 
-def read_uploaded_file(file_storage) -> pd.DataFrame:
+def read_uploaded_file(file_storage) -> "pd.DataFrame":
+    import pandas as pd
+
     name = (file_storage.filename or "").lower()
+    # Prefer the pyarrow / calamine readers; fall back to pandas defaults
     if name.endswith(".csv"):
-        return pd.read_csv(file_storage)
+        try:
+            return pd.read_csv(file_storage, engine="pyarrow")
+        except ImportError:
+            return pd.read_csv(file_storage)
     if name.endswith(".xlsx") or name.endswith(".xls"):
-        return pd.read_excel(file_storage)
+        try:
+            return pd.read_excel(file_storage, engine="calamine")
+        except ImportError:
+            return pd.read_excel(file_storage)
     raise ValueError("Only .csv or .xlsx files are supported.")
 
 
-def topsis(df: pd.DataFrame, weights, impacts) -> pd.DataFrame:
-    if df.shape[1] < 3:
-        raise ValueError("Input file must contain three or more columns.")
+def column_sq_sums(X):
+    import numpy as np
 
-    criteria = df.iloc[:, 1:].copy()
+    # Column sums of squares through a small scratch, a few columns at a time;
+    # each column is summed contiguously (pairwise), as pandas did
+    m, n = X.shape
+    cols = max(1, min(n, (1 << 15) // max(m, 1)))
+    scratch = np.empty((cols, m))
+    out = np.empty(n)
+    for start in range(0, n, cols):
+        stop = min(start + cols, n)
+        np.square(X[:, start:stop].T, out=scratch[: stop - start])
+        np.sum(scratch[: stop - start], axis=1, out=out[start:stop])
+    return out
+
+
+def topsis(df: "pd.DataFrame", weights, impact_signs) -> "pd.DataFrame":
+    import numpy as np
 
-    # Validate numeric criteria columns (2nd to last)
-    for col in criteria.columns:
-        coerced = pd.to_numeric(criteria[col], errors="coerce")
-        if coerced.isna().any():
-            raise ValueError("From 2nd to last columns must contain numeric values only.")
-        criteria[col] = coerced
+    if df.shape[1] < 3:
+        raise ValueError("Input file must contain three or more columns.")
 
-    n = criteria.shape[1]
-    if len(weights) != n or len(impacts) != n:
+    # Cheap shape check before converting the criteria block
+    n = df.shape[1] - 1
+    if len(weights) != n or len(impact_signs) != n:
         raise ValueError("Number of weights, impacts and criteria columns must be the same.")
 
+    # Validate numeric criteria columns (2nd to last) in a single conversion
+    try:
+        X = np.ascontiguousarray(df.iloc[:, 1:].to_numpy(dtype=np.float64))
+    except (TypeError, ValueError):
+        X = None
+    if X is None or np.isnan(X).any():
+        raise ValueError("From 2nd to last columns must contain numeric values only.")
+
+    if X.shape[0] == 0:
+        # Header-only input: an empty result, as before
+        out = df.copy(deep=False)
+        out["Topsis Score"] = np.empty(0)
+        out["Rank"] = np.empty(0, dtype=np.int64)
+        return out
+
     # Normalize (vector normalization)
-    denom = (criteria ** 2).sum(axis=0).pow(0.5).replace(0, 1.0)
-    norm = criteria / denom
+    denom = np.sqrt(column_sq_sums(X))
+    np.copyto(denom, 1.0, where=denom == 0)
 
     # Apply weights
-    weighted = norm * pd.Series(weights, index=criteria.columns)
+    weighted = (X / denom) * np.asarray(weights, dtype=np.float64)
 
     # Ideal best/worst
-    ideal_best = {}
-    ideal_worst = {}
-    for col, imp in zip(criteria.columns, impacts):
-        if imp == "+":
-            ideal_best[col] = weighted[col].max()
-            ideal_worst[col] = weighted[col].min()
-        else:
-            ideal_best[col] = weighted[col].min()
-            ideal_worst[col] = weighted[col].max()
-
-    ideal_best = pd.Series(ideal_best)
-    ideal_worst = pd.Series(ideal_worst)
-
-    d_best = ((weighted - ideal_best) ** 2).sum(axis=1).pow(0.5)
-    d_worst = ((weighted - ideal_worst) ** 2).sum(axis=1).pow(0.5)
+    benefit = np.asarray(impact_signs) > 0
+    col_max = weighted.max(axis=0)
+    col_min = weighted.min(axis=0)
+    ideal_best = np.where(benefit, col_max, col_min)
+    ideal_worst = np.where(benefit, col_min, col_max)
+
+    # Distances, reusing one scratch buffer. Column-major so the row sums
+    # add the criteria in order, exactly as the original pandas code did
+    diff = np.empty_like(weighted, order="F")
+    np.subtract(weighted, ideal_best, out=diff)
+    d_best = np.sqrt(np.square(diff, out=diff).sum(axis=1))
+    np.subtract(weighted, ideal_worst, out=diff)
+    d_worst = np.sqrt(np.square(diff, out=diff).sum(axis=1))
 
     score = d_worst / (d_best + d_worst)
 
-    out = df.copy()
+    out = df.copy(deep=False)
     out["Topsis Score"] = score
-    out["Rank"] = out["Topsis Score"].rank(ascending=False, method="dense").astype(int)
+    out["Rank"] = np.unique(-score, return_inverse=True)[1] + 1
     return out
 
 
-def send_email(to_email: str, attachment_path: str):
+def smtp_settings():
     host = os.environ.get("SMTP_HOST")
     port = int(os.environ.get("SMTP_PORT", "587"))
     user = os.environ.get("SMTP_USER")
@@ -99,21 +157,98 @@ def send_email(to_email: str, attachment_path: str):
     if not host or not user or not pwd:
         raise RuntimeError("SMTP credentials missing. Set SMTP_HOST, SMTP_PORT, SMTP_USER, SMTP_PASS in Replit Secrets.")
 
+    return host, port, user, pwd
+
+
+class SMTPConnection:
+    """Authenticated SMTP session that is opened lazily and reused across sends."""
+
+    KEEPALIVE_SECONDS = 30
+    # Bounds every socket operation, so a half-open connection cannot hang a mail worker
+    TIMEOUT_SECONDS = 30
+
+    def __init__(self):
+        self._smtp = None
+        self._last_used = 0.0
+
+    def _connect(self):
+        import smtplib
+
+        host, port, user, pwd = smtp_settings()
+        s = smtplib.SMTP(host, port, timeout=self.TIMEOUT_SECONDS)
+        try:
+            s.starttls()
+            s.login(user, pwd)
+        except Exception:
+            s.close()
+            raise
+        return s
+
+    def _reset(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except OSError:  # smtplib.SMTPException is an OSError
+                self._smtp.close()
+            self._smtp = None
+
+    def _is_alive(self) -> bool:
+        if time.monotonic() - self._last_used < self.KEEPALIVE_SECONDS:
+            return True
+        try:
+            return self._smtp.noop()[0] == 250
+        except OSError:  # smtplib.SMTPException is an OSError
+            return False
+
+    def send(self, msg: EmailMessage):
+        import smtplib
+
+        # Retry once on a fresh connection if the server dropped the old one
+        for attempt in range(2):
+            if self._smtp is not None and not self._is_alive():
+                self._reset()
+            if self._smtp is None:
+                self._smtp = self._connect()
+            try:
+                self._smtp.send_message(msg)
+                self._last_used = time.monotonic()
+                return
+            except (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError):
+                self._reset()
+                if attempt == 1:
+                    raise
+
+
+# One connection per mail worker thread
+SMTP_LOCAL = threading.local()
+
+
+def smtp_connection() -> SMTPConnection:
+    conn = getattr(SMTP_LOCAL, "conn", None)
+    if conn is None:
+        conn = SMTP_LOCAL.conn = SMTPConnection()
+    return conn
+
+
+def send_email(to_email: str, data: bytes, filename: str = "topsis_result.csv"):
+    _, _, user, _ = smtp_settings()
+
     msg = EmailMessage()
     msg["From"] = user
     msg["To"] = to_email
     msg["Subject"] = "TOPSIS Result"
     msg.set_content("Attached is your TOPSIS output CSV (with Topsis Score and Rank).")
 
-    with open(attachment_path, "rb") as f:
-        data = f.read()
+    msg.add_attachment(data, maintype="text", subtype="csv", filename=filename)
+
+    smtp_connection().send(msg)
 
-    msg.add_attachment(data, maintype="text", subtype="csv", filename="topsis_result.csv")
 
-    with smtplib.SMTP(host, port) as s:
-        s.starttls()
-        s.login(user, pwd)
-        s.send_message(msg)
+def send_email_and_log(to_email: str, data: bytes, filename: str):
+    try:
+        send_email(to_email, data, filename)
+    except Exception:
+        print(traceback.format_exc())
 
 
 @app.route("/", methods=["GET", "POST"])
@@ -128,26 +263,28 @@ def index():
             flash("Please upload input file.")
             return redirect("/")
 
-        if not EMAIL_RE.match(email):
+        if not is_valid_email(email):
             flash("Format of email id must be correct.")
             return redirect("/")
 
         try:
-            weights, impacts = parse_weights_impacts(weights_s, impacts_s)
+            # validate the small form fields before paying for the file parse
+            weights, impact_signs = parse_weights_impacts(weights_s, impacts_s)
             df = read_uploaded_file(f)
-            res = topsis(df, weights, impacts)
+            res = topsis(df, weights, impact_signs)
 
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".csv") as tmp:
-                out_path = tmp.name
-            res.to_csv(out_path, index=False)
+            # the CSV is built in memory and attached directly, no temp file
+            buf = io.BytesIO()
+            res.to_csv(buf, index=False)
 
-            # result emailed successfully
-            send_email(email, out_path)
-            flash("Result emailed successfully!")
+            # result is emailed in the background; missing SMTP config is
+            # still reported here rather than lost in the worker
+            smtp_settings()
+            MAIL_POOL.submit(send_email_and_log, email, buf.getvalue(), "topsis_result.csv")
+            flash("Result will be emailed shortly!")
             return redirect("/")
 
         except Exception as e:
-            import traceback
             print(traceback.format_exc())
             flash(str(e))
             return redirect("/")
@@ -158,4 +295,6 @@ def index():
 if __name__ == "__main__":
     # Replit serves via 0.0.0.0 and PORT
     port = int(os.environ.get("PORT", "5000"))
-    app.run(host="0.0.0.0", port=port, debug=True)
+    # Debugger/reloader only on request; production should use e.g. `gunicorn -w 4 -k gthread app:app`
+    debug = os.environ.get("FLASK_DEBUG", "0") == "1"
+    app.run(host="0.0.0.0", port=port, debug=debug, threaded=True)
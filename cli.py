@@ -1,6 +1,10 @@
+import os
 import sys
 
-from .core import TopsisError, topsis_from_file
+from .core import TopsisError, topsis_from_file, topsis_from_file_streaming
+
+# Inputs larger than this are processed in chunks instead of loaded whole
+STREAMING_THRESHOLD_BYTES = 100 * 1024 * 1024
 
 
 def main() -> None:
@@ -16,8 +20,11 @@ def main() -> None:
     _, input_path, weights_s, impacts_s, output_path = argv
 
     try:
-        result = topsis_from_file(input_path, weights_s, impacts_s)
-        result.to_csv(output_path, index=False)
+        if os.path.isfile(input_path) and os.path.getsize(input_path) > STREAMING_THRESHOLD_BYTES:
+            topsis_from_file_streaming(input_path, weights_s, impacts_s, output_path)
+        else:
+            result = topsis_from_file(input_path, weights_s, impacts_s)
+            result.to_csv(output_path, index=False)
         print(f"Success: Result written to {output_path}")
     except TopsisError as e:
         print(f"Error: {e}")
@@ -1,91 +1,336 @@
-import math
 import os
-from typing import List, Tuple
+import sys
+from typing import TYPE_CHECKING, List, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
+if TYPE_CHECKING:
+    import polars as pl
+
+
+# Distance computations work on row blocks of about this many cells
+BLOCK_CELLS = 1 << 15
+# ...but never fewer rows than this, so wide inputs still get useful blocks
+MIN_BLOCK_ROWS = 256
+
+# The numba kernel is opt-in (TOPSIS_NUMBA=1): its import alone costs about
+# as much as scoring millions of cells with NumPy. Even then it is only used
+# for inputs of at least NUMBA_MIN_CELLS cells
+USE_NUMBA = os.environ.get("TOPSIS_NUMBA", "0") == "1"
+NUMBA_MIN_CELLS = 10_000_000
+
 
 class TopsisError(Exception):
     """Raised for TOPSIS input/processing errors."""
 
 
-def _parse_weights_impacts(weights_s: str, impacts_s: str) -> Tuple[List[float], List[str]]:
+def _parse_weights_impacts(weights_s: str, impacts_s: str) -> Tuple[np.ndarray, np.ndarray]:
     if "," not in weights_s or "," not in impacts_s:
         raise TopsisError("Impacts and weights must be separated by ',' (comma).")
 
-    weights_raw = [w.strip() for w in weights_s.split(",") if w.strip() != ""]
-    impacts_raw = [i.strip() for i in impacts_s.split(",") if i.strip() != ""]
-
     try:
-        weights = [float(w) for w in weights_raw]
+        weights = np.array([w for w in weights_s.split(",") if w.strip() != ""], dtype=np.float64)
     except ValueError as e:
         raise TopsisError("Weights must be numeric values separated by commas.") from e
 
-    impacts = impacts_raw
-    for imp in impacts:
-        if imp not in ["+", "-"]:
-            raise TopsisError("Impacts must be either '+' or '-' separated by commas.")
+    impacts = [i for i in map(str.strip, impacts_s.split(",")) if i != ""]
+    if not set(impacts) <= {"+", "-"}:
+        raise TopsisError("Impacts must be either '+' or '-' separated by commas.")
+
+    return weights, _impact_signs(impacts)
+
+
+def _impact_signs(impacts) -> np.ndarray:
+    # "+"/"-" impacts as +1.0/-1.0; an already converted sign array passes through
+    impacts = np.asarray(impacts)
+    if impacts.dtype.kind in "US":
+        return np.where(impacts == "+", 1.0, -1.0)
+    return impacts.astype(np.float64, copy=False)
 
-    return weights, impacts
 
+def _is_polars(df) -> bool:
+    # polars is optional; if it was never imported, df cannot be one of its frames
+    pl = sys.modules.get("polars")
+    return pl is not None and isinstance(df, pl.DataFrame)
 
-def _validate_input_df(df: pd.DataFrame) -> None:
+
+def _validate_input_df(df: Union[pd.DataFrame, "pl.DataFrame"], dtype=np.float64) -> np.ndarray:
     if df.shape[1] < 3:
         raise TopsisError("Input file must contain three or more columns.")
 
-    crit = df.iloc[:, 1:]
-    for col in crit.columns:
-        coerced = pd.to_numeric(crit[col], errors="coerce")
-        if coerced.isna().any():
-            raise TopsisError("From 2nd to last columns must contain numeric values only.")
+    try:
+        if _is_polars(df):
+            # polars nulls come back as NaN and are rejected below
+            values = df.select(df.columns[1:]).to_numpy().astype(dtype, copy=False)
+        else:
+            values = df.iloc[:, 1:].to_numpy(dtype=dtype)
+    except (TypeError, ValueError) as e:
+        raise TopsisError("From 2nd to last columns must contain numeric values only.") from e
+    if np.isnan(values).any():
+        raise TopsisError("From 2nd to last columns must contain numeric values only.")
+    return values
+
+
+def _column_sq_sums(X: np.ndarray) -> np.ndarray:
+    # Column sums of squares, a few columns at a time through a small float64
+    # scratch (float32 input is squared in float64 without a full-size copy);
+    # each column is summed contiguously (pairwise), as pandas did
+    m, n = X.shape
+    cols = max(1, min(n, BLOCK_CELLS // max(m, 1)))
+    scratch = np.empty((cols, m))
+    out = np.empty(n)
+    for start in range(0, n, cols):
+        stop = min(start + cols, n)
+        k = stop - start
+        np.square(X[:, start:stop].T, out=scratch[:k], dtype=np.float64)
+        np.sum(scratch[:k], axis=1, out=out[start:stop])
+    return out
+
+
+def _weighted_ideals(col_min, col_max, denom, weights, impact_signs) -> np.ndarray:
+    # Column extremes of the weighted matrix follow from the raw extremes;
+    # row 0 is the ideal best, row 1 the ideal worst
+    lo = col_min / denom * weights
+    hi = col_max / denom * weights
+    w_max = np.maximum(lo, hi)
+    w_min = np.minimum(lo, hi)
+    benefit = impact_signs > 0
+    return np.stack([np.where(benefit, w_max, w_min), np.where(benefit, w_min, w_max)])
 
 
-def topsis_dataframe(df: pd.DataFrame, weights: List[float], impacts: List[str]) -> pd.DataFrame:
-    out = df.copy()
+def _squared_distances(X: np.ndarray, denom: np.ndarray, weights: np.ndarray, ideals: np.ndarray) -> np.ndarray:
+    # Both distances in one pass over X, block by block so the scratch stays
+    # small; returns shape (2, m)
+    m, n = X.shape
+    rows = max(1, min(m, max(MIN_BLOCK_ROWS, BLOCK_CELLS // max(n, 1))))
+    weighted = np.empty((rows, n), dtype=X.dtype)
+    # (2, n, rows) scratch: each row's criteria are strided, so the row sums
+    # add them in order, exactly as the original pandas code did
+    diff = np.empty((2, n, rows), dtype=np.result_type(X, ideals))
+    d2 = np.empty((2, m), dtype=diff.dtype)
+    for start in range(0, m, rows):
+        stop = min(start + rows, m)
+        k = stop - start
+        block = diff[:, :, :k]
+        # (X / denom) * weights, in the same order as the original implementation
+        np.divide(X[start:stop], denom, out=weighted[:k])
+        np.multiply(weighted[:k], weights, out=weighted[:k])
+        np.subtract(weighted[None, :k], ideals[:, None, :], out=block.transpose(0, 2, 1))
+        np.square(block, out=block)
+        np.sum(block, axis=1, out=d2[:, start:stop])
+    return d2
 
-    crit = out.iloc[:, 1:].apply(pd.to_numeric)
-    n_criteria = crit.shape[1]
+
+def _topsis_scores(X: np.ndarray, weights: np.ndarray, impact_signs: np.ndarray, kernel=None) -> np.ndarray:
+    denom = np.sqrt(_column_sq_sums(X))
+    np.copyto(denom, 1.0, where=denom == 0)
+
+    denom = denom.astype(X.dtype, copy=False)
+    weights = weights.astype(X.dtype, copy=False)
+    ideals = _weighted_ideals(X.min(axis=0), X.max(axis=0), denom, weights, impact_signs)
+
+    if kernel is not None:
+        return kernel(X, denom, weights, ideals)
+    d_best, d_worst = np.sqrt(_squared_distances(X, denom, weights, ideals))
+    return d_worst / (d_best + d_worst)
+
+
+_topsis_kernel = None
+_kernel_loaded = False
+
+
+def _load_kernel():
+    # numba is optional and slow to import; only pulled in when opted in
+    global _topsis_kernel, _kernel_loaded
+    if not _kernel_loaded:
+        _kernel_loaded = True
+        try:
+            from numba import njit, prange
+        except ImportError:  # fall back to the NumPy path
+            return None
+
+        # Row pass only: norms and ideals come from the NumPy code, and each
+        # row is summed in criteria order, so scores match it bit for bit
+        @njit(parallel=True, cache=True)
+        def kernel(X, denom, weights, ideals):
+            m, n = X.shape
+            scores = np.empty(m)
+            for i in prange(m):
+                d_best2 = 0.0
+                d_worst2 = 0.0
+                for j in range(n):
+                    v = X[i, j] / denom[j] * weights[j]
+                    db = v - ideals[0, j]
+                    dw = v - ideals[1, j]
+                    d_best2 += db * db
+                    d_worst2 += dw * dw
+                d_worst = np.sqrt(d_worst2)
+                scores[i] = d_worst / (np.sqrt(d_best2) + d_worst)
+            return scores
+
+        _topsis_kernel = kernel
+    return _topsis_kernel
+
+
+def _score_and_rank(X: np.ndarray, weights, impacts, dtype=np.float64) -> Tuple[np.ndarray, np.ndarray]:
+    n_criteria = X.shape[1]
 
     if len(weights) != n_criteria or len(impacts) != n_criteria:
         raise TopsisError(
             "The number of weights, impacts and number of columns (from 2nd to last) must be the same."
         )
 
-    denom = (crit ** 2).sum(axis=0).apply(math.sqrt)
-    denom = denom.replace(0, 1.0)
-    norm = crit / denom
+    X = np.ascontiguousarray(X, dtype=dtype)
+    if X.shape[0] == 0:
+        # Header-only input: an empty result, as the original implementation wrote
+        return np.empty(0, dtype=X.dtype), np.empty(0, dtype=np.int64)
 
-    w = pd.Series(weights, index=crit.columns, dtype=float)
-    weighted = norm * w
+    w = np.asarray(weights, dtype=np.float64)
+    signs = _impact_signs(impacts)
 
-    ideal_best = pd.Series(index=crit.columns, dtype=float)
-    ideal_worst = pd.Series(index=crit.columns, dtype=float)
-    for col, imp in zip(crit.columns, impacts):
-        if imp == "+":
-            ideal_best[col] = weighted[col].max()
-            ideal_worst[col] = weighted[col].min()
-        else:
-            ideal_best[col] = weighted[col].min()
-            ideal_worst[col] = weighted[col].max()
+    # float32 stays on the NumPy path so the kernel only compiles one signature
+    use_kernel = USE_NUMBA and X.dtype == np.float64 and X.size >= NUMBA_MIN_CELLS
+    score = _topsis_scores(X, w, signs, _load_kernel() if use_kernel else None)
 
-    d_best = ((weighted - ideal_best) ** 2).sum(axis=1).apply(math.sqrt)
-    d_worst = ((weighted - ideal_worst) ** 2).sum(axis=1).apply(math.sqrt)
+    return score, np.unique(-score, return_inverse=True)[1] + 1
 
-    score = d_worst / (d_best + d_worst)
+
+def _topsis_result(df: pd.DataFrame, X: np.ndarray, weights, impacts, dtype=np.float64) -> pd.DataFrame:
+    score, rank = _score_and_rank(X, weights, impacts, dtype)
+    out = df.copy(deep=False)
     out["Topsis Score"] = score
-    out["Rank"] = out["Topsis Score"].rank(ascending=False, method="dense").astype(int)
+    out["Rank"] = rank
     return out
 
 
+def _topsis_polars(df, weights, impacts, dtype=np.float64):
+    import polars as pl
+
+    X = _validate_input_df(df, dtype)
+    score, rank = _score_and_rank(X, weights, impacts, dtype)
+    # with_columns shares the existing Arrow buffers; only the new columns are allocated
+    return df.with_columns(pl.Series("Topsis Score", score), pl.Series("Rank", rank))
+
+
+def topsis_dataframe(
+    df: Union[pd.DataFrame, "pl.DataFrame"], weights: List[float], impacts: List[str], dtype=None
+) -> Union[pd.DataFrame, "pl.DataFrame"]:
+    # dtype defaults to float64; np.float32 is opt-in and can create rank ties
+    if dtype is None:
+        dtype = np.float64
+
+    # A polars DataFrame is accepted too and a polars DataFrame is returned
+    if _is_polars(df):
+        return _topsis_polars(df, weights, impacts, dtype)
+
+    # Numeric columns convert without re-parsing; numeric strings are parsed once
+    # here, and missing or non-numeric values raise TopsisError
+    X = _validate_input_df(df, dtype)
+    return _topsis_result(df, X, weights, impacts, dtype)
+
+
+def _read_csv(path) -> pd.DataFrame:
+    # pyarrow's multi-threaded parser when available, else pandas' C engine
+    try:
+        return pd.read_csv(path, engine="pyarrow")
+    except ImportError:
+        return pd.read_csv(path)
+
+
 def topsis_from_file(input_path: str, weights_s: str, impacts_s: str) -> pd.DataFrame:
     if not os.path.isfile(input_path):
         raise TopsisError("File not Found")
 
+    # Fail on malformed weights/impacts before reading a possibly large file
+    weights, impact_signs = _parse_weights_impacts(weights_s, impacts_s)
+
     try:
-        df = pd.read_csv(input_path)
+        df = _read_csv(input_path)
     except Exception as e:
         raise TopsisError("Unable to read input file. Ensure it is a valid CSV.") from e
 
-    _validate_input_df(df)
-    weights, impacts = _parse_weights_impacts(weights_s, impacts_s)
-    return topsis_dataframe(df, weights, impacts)
+    X = _validate_input_df(df)
+    return _topsis_result(df, X, weights, impact_signs)
+
+
+def _common_dtype(dtypes):
+    # Numeric columns widen as a whole-file read would; anything else is kept as text
+    if all(dt.kind in "iuf" for dt in dtypes):
+        return np.result_type(*dtypes)
+    return str
+
+
+def topsis_from_file_streaming(
+    input_path: str, weights_s: str, impacts_s: str, output_path: str, chunksize: int = 100_000
+) -> None:
+    """Run TOPSIS over a large CSV chunk by chunk and write the result to output_path."""
+    if not os.path.isfile(input_path):
+        raise TopsisError("File not Found")
+
+    weights, impact_signs = _parse_weights_impacts(weights_s, impacts_s)
+
+    # Pass 1: column sums of squares and extremes (also validates every chunk)
+    col_sq = col_min = col_max = None
+    chunk_dtypes = {}
+    n_rows = 0
+    try:
+        with pd.read_csv(input_path, chunksize=chunksize) as reader:
+            for chunk in reader:
+                X = _validate_input_df(chunk)
+                if col_sq is None:
+                    col_sq = np.zeros(X.shape[1])
+                    col_min = np.full(X.shape[1], np.inf)
+                    col_max = np.full(X.shape[1], -np.inf)
+                col_sq += _column_sq_sums(X)
+                # initial= keeps a header-only chunk from failing the reduction
+                np.minimum(col_min, X.min(axis=0, initial=np.inf), out=col_min)
+                np.maximum(col_max, X.max(axis=0, initial=-np.inf), out=col_max)
+                n_rows += X.shape[0]
+                for col, dt in chunk.dtypes.items():
+                    chunk_dtypes.setdefault(col, set()).add(dt)
+    except TopsisError:
+        raise
+    except Exception as e:
+        raise TopsisError("Unable to read input file. Ensure it is a valid CSV.") from e
+
+    if col_sq is None:
+        raise TopsisError("Unable to read input file. Ensure it is a valid CSV.")
+
+    n_criteria = col_sq.shape[0]
+    if len(weights) != n_criteria or len(impact_signs) != n_criteria:
+        raise TopsisError(
+            "The number of weights, impacts and number of columns (from 2nd to last) must be the same."
+        )
+
+    denom = np.sqrt(col_sq)
+    np.copyto(denom, 1.0, where=denom == 0)
+    ideals = _weighted_ideals(col_min, col_max, denom, weights, impact_signs)
+
+    # Pass 2: squared distances per row
+    d2 = np.empty((2, n_rows))
+    start = 0
+    usecols = list(range(1, n_criteria + 1))
+    with pd.read_csv(input_path, chunksize=chunksize, usecols=usecols) as reader:
+        for chunk in reader:
+            X = chunk.to_numpy(dtype=np.float64)
+            stop = start + X.shape[0]
+            d2[:, start:stop] = _squared_distances(X, denom, weights, ideals)
+            start = stop
+
+    d_best, d_worst = np.sqrt(d2)
+    score = d_worst / (d_best + d_worst)
+    rank = np.unique(-score, return_inverse=True)[1] + 1
+
+    # Pass 3: write the original rows with score and rank appended. Columns
+    # inferred differently across chunks (e.g. int in one, float in another)
+    # get one dtype, so every chunk formats them the same way
+    dtype = {col: _common_dtype(dts) for col, dts in chunk_dtypes.items() if len(dts) > 1}
+    start = 0
+    with pd.read_csv(input_path, chunksize=chunksize, dtype=dtype) as reader, open(output_path, "wb") as fh:
+        for chunk in reader:
+            stop = start + chunk.shape[0]
+            chunk["Topsis Score"] = score[start:stop]
+            chunk["Rank"] = rank[start:stop]
+            chunk.to_csv(fh, header=start == 0, index=False)
+            start = stop
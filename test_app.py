@@ -0,0 +1,129 @@
+import smtplib
+from email.message import EmailMessage
+
+import pytest
+
+from . import app
+
+
+class FakeSMTP:
+    """Records calls instead of talking to a server; failures are scripted per instance."""
+
+    instances = []
+    # send_message failures for the next connections, in order
+    send_failures = []
+    noop_code = 250
+
+    def __init__(self, host, port, timeout=None):
+        self.host, self.port, self.timeout = host, port, timeout
+        self.sent = []
+        self.noops = 0
+        self.closed = False
+        self.fail_send = FakeSMTP.send_failures.pop(0) if FakeSMTP.send_failures else None
+        FakeSMTP.instances.append(self)
+
+    def starttls(self):
+        pass
+
+    def login(self, user, pwd):
+        pass
+
+    def noop(self):
+        self.noops += 1
+        if self.noop_code is None:
+            raise smtplib.SMTPServerDisconnected("gone")
+        return self.noop_code, b""
+
+    def send_message(self, msg):
+        if self.fail_send is not None:
+            raise self.fail_send
+        self.sent.append(msg)
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def conn(monkeypatch):
+    monkeypatch.setenv("SMTP_HOST", "smtp.example.com")
+    monkeypatch.setenv("SMTP_PORT", "2525")
+    monkeypatch.setenv("SMTP_USER", "user")
+    monkeypatch.setenv("SMTP_PASS", "secret")
+    monkeypatch.setattr(smtplib, "SMTP", FakeSMTP)
+    monkeypatch.setattr(FakeSMTP, "instances", [])
+    monkeypatch.setattr(FakeSMTP, "send_failures", [])
+    return app.SMTPConnection()
+
+
+def _message():
+    msg = EmailMessage()
+    msg["To"] = "someone@example.com"
+    msg.set_content("result")
+    return msg
+
+
+def _go_idle(conn):
+    conn._last_used -= conn.KEEPALIVE_SECONDS + 1
+
+
+def test_connects_with_timeout_and_reuses_connection(conn):
+    conn.send(_message())
+    conn.send(_message())
+
+    (smtp,) = FakeSMTP.instances
+    assert (smtp.host, smtp.port) == ("smtp.example.com", 2525)
+    assert smtp.timeout == app.SMTPConnection.TIMEOUT_SECONDS
+    assert len(smtp.sent) == 2
+    # recently used: no NOOP round trip
+    assert smtp.noops == 0
+
+
+@pytest.mark.parametrize(
+    "error", [smtplib.SMTPServerDisconnected("closed"), ConnectionResetError(), TimeoutError()]
+)
+def test_reconnects_and_retries_once(conn, error):
+    FakeSMTP.send_failures.append(error)
+    conn.send(_message())
+
+    first, second = FakeSMTP.instances
+    assert first.closed and first.sent == []
+    assert len(second.sent) == 1
+
+
+def test_gives_up_after_one_retry(conn):
+    FakeSMTP.send_failures.extend([TimeoutError(), TimeoutError()])
+    with pytest.raises(TimeoutError):
+        conn.send(_message())
+
+    assert len(FakeSMTP.instances) == 2
+    assert all(smtp.closed for smtp in FakeSMTP.instances)
+
+    # the next send starts over on a fresh connection
+    conn.send(_message())
+    assert len(FakeSMTP.instances) == 3
+    assert len(FakeSMTP.instances[2].sent) == 1
+
+
+def test_idle_connection_is_checked_with_noop(conn):
+    conn.send(_message())
+    _go_idle(conn)
+    conn.send(_message())
+
+    (smtp,) = FakeSMTP.instances
+    assert smtp.noops == 1
+    assert len(smtp.sent) == 2
+
+
+@pytest.mark.parametrize("noop_code", [421, None])
+def test_dead_idle_connection_is_replaced(conn, monkeypatch, noop_code):
+    conn.send(_message())
+    monkeypatch.setattr(FakeSMTP, "noop_code", noop_code)
+    _go_idle(conn)
+    conn.send(_message())
+
+    first, second = FakeSMTP.instances
+    assert first.closed and len(first.sent) == 1
+    assert len(second.sent) == 1
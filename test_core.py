@@ -0,0 +1,154 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from . import core
+from .core import TopsisError, topsis_dataframe, topsis_from_file, topsis_from_file_streaming
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DATA = os.path.join(HERE, "data.csv")
+WEIGHTS = "1,1,1,1,1"
+IMPACTS = "+,+,-,+,+"
+
+
+def _write(path, text):
+    path.write_text(text)
+    return str(path)
+
+
+def _assert_same_result(streamed_path, expected):
+    streamed = pd.read_csv(streamed_path)
+    assert list(streamed.columns) == list(expected.columns)
+    np.testing.assert_allclose(streamed["Topsis Score"], expected["Topsis Score"], rtol=1e-12)
+    assert (streamed["Rank"].to_numpy() == expected["Rank"].to_numpy()).all()
+
+
+@pytest.mark.parametrize("chunksize", [1, 3, 100_000])
+def test_streaming_matches_in_memory(tmp_path, chunksize):
+    out = str(tmp_path / "out.csv")
+    topsis_from_file_streaming(DATA, WEIGHTS, IMPACTS, out, chunksize=chunksize)
+
+    expected = topsis_from_file(DATA, WEIGHTS, IMPACTS)
+    _assert_same_result(out, expected)
+
+
+def test_streaming_matches_reference_output(tmp_path):
+    out = tmp_path / "out.csv"
+    topsis_from_file_streaming(DATA, WEIGHTS, IMPACTS, str(out), chunksize=2)
+
+    with open(os.path.join(HERE, "output-result.csv"), "rb") as fh:
+        assert out.read_bytes() == fh.read()
+
+
+def test_streaming_formats_columns_consistently_across_chunks(tmp_path):
+    # first chunk parses C1 as int, second as float; id is int then missing
+    src = _write(tmp_path / "in.csv", "Fund,C1,C2\n1,53,2\n2,40,3\n,12.5,4\n4,7,1\n")
+    out = tmp_path / "out.csv"
+    topsis_from_file_streaming(src, "1,1", "+,-", str(out), chunksize=2)
+
+    expected = topsis_from_file(src, "1,1", "+,-")
+    _assert_same_result(str(out), expected)
+
+    lines = out.read_text().splitlines()
+    assert [line.split(",")[:2] for line in lines[1:]] == [
+        ["1.0", "53.0"],
+        ["2.0", "40.0"],
+        ["", "12.5"],
+        ["4.0", "7.0"],
+    ]
+
+
+@pytest.mark.parametrize(
+    "text, weights, impacts, message",
+    [
+        ("Fund,C1\nA,1\nB,2\n", "1,1", "+,+", "three or more columns"),
+        ("Fund,C1,C2\nA,1,2\nB,x,3\n", "1,1", "+,+", "numeric values only"),
+        ("Fund,C1,C2\nA,1,2\nB,,3\n", "1,1", "+,+", "numeric values only"),
+        ("Fund,C1,C2\nA,1,2\nB,3,4\n", "1,1,1", "+,+,+", "must be the same"),
+        ("Fund,C1,C2\nA,1,2\nB,3,4\n", "1;1", "+,+", "separated by ','"),
+        ("Fund,C1,C2\nA,1,2\nB,3,4\n", "1,a", "+,+", "Weights must be numeric"),
+        ("Fund,C1,C2\nA,1,2\nB,3,4\n", "1,1", "+,*", "Impacts must be"),
+    ],
+)
+def test_streaming_errors(tmp_path, text, weights, impacts, message):
+    src = _write(tmp_path / "in.csv", text)
+    out = tmp_path / "out.csv"
+
+    with pytest.raises(TopsisError, match=message):
+        topsis_from_file_streaming(src, weights, impacts, str(out), chunksize=1)
+    with pytest.raises(TopsisError, match=message):
+        topsis_from_file(src, weights, impacts)
+    assert not out.exists()
+
+
+def test_streaming_missing_file(tmp_path):
+    out = tmp_path / "out.csv"
+    with pytest.raises(TopsisError, match="File not Found"):
+        topsis_from_file_streaming(str(tmp_path / "missing.csv"), WEIGHTS, IMPACTS, str(out))
+    assert not out.exists()
+
+
+def test_streaming_empty_file(tmp_path):
+    src = _write(tmp_path / "in.csv", "")
+    out = tmp_path / "out.csv"
+    with pytest.raises(TopsisError, match="Unable to read input file"):
+        topsis_from_file_streaming(src, WEIGHTS, IMPACTS, str(out))
+    assert not out.exists()
+
+
+def test_dataframe_rejects_missing_values():
+    df = pd.DataFrame({"Fund": ["A", "B", "C"], "x": [1, np.nan, 3], "y": [1, 2, 3]})
+    with pytest.raises(TopsisError, match="numeric values only"):
+        topsis_dataframe(df, [1, 1], ["+", "+"])
+
+
+def test_header_only_input_gives_empty_result(tmp_path):
+    src = _write(tmp_path / "in.csv", "Fund,C1,C2\n")
+    out = tmp_path / "out.csv"
+    topsis_from_file(src, "1,1", "+,-").to_csv(out, index=False)
+    assert out.read_text() == "Fund,C1,C2,Topsis Score,Rank\n"
+
+    topsis_from_file_streaming(src, "1,1", "+,-", str(out))
+    assert out.read_text() == "Fund,C1,C2,Topsis Score,Rank\n"
+
+
+def test_numba_kernel_matches_numpy():
+    pytest.importorskip("numba")
+    rng = np.random.default_rng(0)
+    X = rng.random((1000, 7)) * 100
+    weights = rng.integers(1, 4, 7).astype(np.float64)
+    signs = np.where(rng.random(7) > 0.5, 1.0, -1.0)
+
+    expected = core._topsis_scores(X, weights, signs)
+    assert (core._topsis_scores(X, weights, signs, core._load_kernel()) == expected).all()
+
+
+def test_polars_dataframe_matches_pandas():
+    pl = pytest.importorskip("polars")
+    df = pd.read_csv(DATA)
+    weights, impacts = [1, 1, 1, 1, 1], ["+", "+", "-", "+", "+"]
+
+    result = topsis_dataframe(pl.from_pandas(df), weights, impacts)
+    expected = topsis_dataframe(df, weights, impacts)
+
+    assert isinstance(result, pl.DataFrame)
+    assert result.columns == list(expected.columns)
+    assert (result["Topsis Score"].to_numpy() == expected["Topsis Score"].to_numpy()).all()
+    assert (result["Rank"].to_numpy() == expected["Rank"].to_numpy()).all()
+
+
+@pytest.mark.parametrize(
+    "columns, message",
+    [
+        ({"Fund": ["A", "B", "C"], "x": [1.0, None, 3.0], "y": [1, 2, 3]}, "numeric values only"),
+        ({"Fund": ["A", "B", "C"], "x": [1, None, 3], "y": [1, 2, 3]}, "numeric values only"),
+        ({"Fund": ["A", "B", "C"], "x": ["1", "x", "3"], "y": [1, 2, 3]}, "numeric values only"),
+        ({"Fund": ["A", "B", "C"], "x": [1, 2, 3]}, "three or more columns"),
+    ],
+)
+def test_polars_dataframe_errors(columns, message):
+    pl = pytest.importorskip("polars")
+    with pytest.raises(TopsisError, match=message):
+        topsis_dataframe(pl.DataFrame(columns), [1] * (len(columns) - 1), ["+"] * (len(columns) - 1))
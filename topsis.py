@@ -1,9 +1,9 @@
 #!/usr/bin/env python3
-import math
 import os
 import sys
 from typing import List, Tuple
 
+import numpy as np
 import pandas as pd
 
 
@@ -12,83 +12,110 @@ def _die(msg: str, code: int = 1) -> None:
     sys.exit(code)
 
 
-def _parse_weights_impacts(weights_s: str, impacts_s: str) -> Tuple[List[float], List[str]]:
+def _parse_weights_impacts(weights_s: str, impacts_s: str) -> Tuple[np.ndarray, np.ndarray]:
     if "," not in weights_s or "," not in impacts_s:
         _die("Error: Impacts and weights must be separated by ',' (comma).")
 
-    weights_raw = [w.strip() for w in weights_s.split(",") if w.strip() != ""]
-    impacts_raw = [i.strip() for i in impacts_s.split(",") if i.strip() != ""]
-
     try:
-        weights = [float(w) for w in weights_raw]
+        weights = np.array([w for w in weights_s.split(",") if w.strip() != ""], dtype=np.float64)
     except ValueError:
         _die("Error: Weights must be numeric values separated by commas.")
 
-    impacts = impacts_raw
-    for imp in impacts:
-        if imp not in ["+", "-"]:
-            _die("Error: Impacts must be either '+' or '-' separated by commas.")
+    impacts = [i for i in map(str.strip, impacts_s.split(",")) if i != ""]
+    if not set(impacts) <= {"+", "-"}:
+        _die("Error: Impacts must be either '+' or '-' separated by commas.")
 
-    return weights, impacts
+    # +1.0 for benefit (+), -1.0 for cost (-) criteria
+    impact_signs = np.where(np.array(impacts) == "+", 1.0, -1.0)
+    return weights, impact_signs
 
 
-def _validate_input_df(df: pd.DataFrame) -> None:
+def _validate_input_df(df: pd.DataFrame) -> np.ndarray:
     if df.shape[1] < 3:
         _die("Error: Input file must contain three or more columns.")
 
     # From 2nd to last must be numeric
-    crit = df.iloc[:, 1:]
-    for col in crit.columns:
-        # try convert to numeric; if any non-numeric -> error
-        coerced = pd.to_numeric(crit[col], errors="coerce")
-        if coerced.isna().any():
-            _die("Error: From 2nd to last columns must contain numeric values only.")
-
+    # convert the whole block at once; any non-numeric or missing value -> error
+    try:
+        values = df.iloc[:, 1:].to_numpy(dtype=np.float64)
+    except (TypeError, ValueError):
+        _die("Error: From 2nd to last columns must contain numeric values only.")
+    if np.isnan(values).any():
+        _die("Error: From 2nd to last columns must contain numeric values only.")
+    return values
+
+
+def _column_sq_sums(X):
+    # Column sums of squares through a small scratch, a few columns at a time;
+    # each column is summed contiguously (pairwise), as pandas did
+    m, n = X.shape
+    cols = max(1, min(n, (1 << 15) // max(m, 1)))
+    scratch = np.empty((cols, m))
+    out = np.empty(n)
+    for start in range(0, n, cols):
+        stop = min(start + cols, n)
+        np.square(X[:, start:stop].T, out=scratch[: stop - start])
+        np.sum(scratch[: stop - start], axis=1, out=out[start:stop])
+    return out
 
-def topsis(df: pd.DataFrame, weights: List[float], impacts: List[str]) -> pd.DataFrame:
-    # Work on a copy
-    out = df.copy()
 
-    crit = out.iloc[:, 1:].apply(pd.to_numeric)
-    n_criteria = crit.shape[1]
+def topsis(df: pd.DataFrame, X: np.ndarray, weights: np.ndarray, impact_signs: np.ndarray) -> pd.DataFrame:
+    # X is the criteria block already converted by _validate_input_df
+    n_criteria = X.shape[1]
 
-    if len(weights) != n_criteria or len(impacts) != n_criteria:
+    if len(weights) != n_criteria or len(impact_signs) != n_criteria:
         _die(
             "Error: The number of weights, impacts and number of columns (from 2nd to last) must be the same."
         )
 
+    if X.shape[0] == 0:
+        # Header-only input: an empty result, as before
+        out = df.copy(deep=False)
+        out["Topsis Score"] = np.empty(0)
+        out["Rank"] = np.empty(0, dtype=np.int64)
+        return out
+
     # Normalize
-    denom = (crit ** 2).sum(axis=0).apply(math.sqrt)
-    denom = denom.replace(0, 1.0)  # avoid divide-by-zero
-    norm = crit / denom
+    denom = np.sqrt(_column_sq_sums(X))
+    np.copyto(denom, 1.0, where=denom == 0)  # avoid divide-by-zero
 
     # Weight
-    w = pd.Series(weights, index=crit.columns, dtype=float)
-    weighted = norm * w
+    weighted = (X / denom) * np.asarray(weights, dtype=np.float64)
 
     # Ideal best/worst
-    ideal_best = pd.Series(index=crit.columns, dtype=float)
-    ideal_worst = pd.Series(index=crit.columns, dtype=float)
-    for col, imp in zip(crit.columns, impacts):
-        if imp == "+":
-            ideal_best[col] = weighted[col].max()
-            ideal_worst[col] = weighted[col].min()
-        else:
-            ideal_best[col] = weighted[col].min()
-            ideal_worst[col] = weighted[col].max()
-
-    # Distances
-    d_best = ((weighted - ideal_best) ** 2).sum(axis=1).apply(math.sqrt)
-    d_worst = ((weighted - ideal_worst) ** 2).sum(axis=1).apply(math.sqrt)
+    benefit = impact_signs > 0
+    col_max = weighted.max(axis=0)
+    col_min = weighted.min(axis=0)
+    ideal_best = np.where(benefit, col_max, col_min)
+    ideal_worst = np.where(benefit, col_min, col_max)
+
+    # Distances, reusing one scratch buffer. Column-major so the row sums
+    # add the criteria in order, exactly as the original pandas code did
+    diff = np.empty_like(weighted, order="F")
+    np.subtract(weighted, ideal_best, out=diff)
+    d_best = np.sqrt(np.square(diff, out=diff).sum(axis=1))
+    np.subtract(weighted, ideal_worst, out=diff)
+    d_worst = np.sqrt(np.square(diff, out=diff).sum(axis=1))
 
     score = d_worst / (d_best + d_worst)
+
+    # Shallow copy: shares the input columns, only the new ones are added
+    out = df.copy(deep=False)
     out["Topsis Score"] = score
 
-    # Rank: higher score is better
-    out["Rank"] = out["Topsis Score"].rank(ascending=False, method="dense").astype(int)
+    # Rank: higher score is better (dense: ties share a rank)
+    out["Rank"] = np.unique(-score, return_inverse=True)[1] + 1
     return out
 
 
+def _read_csv(path) -> pd.DataFrame:
+    # pyarrow's multi-threaded parser when available, else pandas' C engine
+    try:
+        return pd.read_csv(path, engine="pyarrow")
+    except ImportError:
+        return pd.read_csv(path)
+
+
 def main(argv: List[str]) -> None:
     if len(argv) != 5:
         _die(
@@ -101,15 +128,17 @@ def main(argv: List[str]) -> None:
     if not os.path.isfile(input_path):
         _die("Error: File not Found")
 
+    # Fail on malformed weights/impacts before reading a possibly large file
+    weights, impact_signs = _parse_weights_impacts(weights_s, impacts_s)
+
     try:
-        df = pd.read_csv(input_path)
+        df = _read_csv(input_path)
     except Exception:
         _die("Error: Unable to read input file. Ensure it is a valid CSV.")
 
-    _validate_input_df(df)
-    weights, impacts = _parse_weights_impacts(weights_s, impacts_s)
+    X = _validate_input_df(df)
 
-    result = topsis(df, weights, impacts)
+    result = topsis(df, X, weights, impact_signs)
 
     try:
         result.to_csv(output_path, index=False)